@@ -109,6 +109,13 @@ def time_str_to_seconds(time_str: Optional[str]) -> Optional[int]:
         return int(m) * 60 + int(s)
     except Exception:
         return None
+
+def _time_strs_to_seconds(values: pd.Series) -> pd.Series:
+    """Vectorized time_str_to_seconds over a Series: 'MM:SS' strings to seconds, anything else to NaN."""
+    parts = values.astype("string").str.extract(r"^\s*([+-]?\d+)\s*:\s*([+-]?\d+)\s*$")
+    # Non-strings never match either: their str() (e.g. 5.0 -> "5.0") has no MM:SS shape
+    seconds = pd.to_numeric(parts[0]) * 60 + pd.to_numeric(parts[1])
+    return seconds.astype("int64") if seconds.notna().all() else seconds.astype("float64")
     
 def _group_merge_index(df: pd.DataFrame, keys: Sequence[str], out_col: str = "merge_idx") -> pd.Series:
     """Helper to create a merge index for deduplication."""
@@ -1722,8 +1729,8 @@ def scrape_html_pbp(game_id: int, return_raw: bool = False) -> pd.DataFrame | tu
     parsed = parse_html_pbp(raw["data"])  # {'data': [...], 'columns': [...], 'home_on_ice': [...], ...}
     df = pd.DataFrame(data=parsed["data"], columns=parsed["columns"])
     df[["timeInPeriod", "timeRemaining"]] = df["Time:Elapsed Game"].apply(_split_time_range)
-    df["timeInPeriodSec"] = df["timeInPeriod"].apply(time_str_to_seconds)
-    df["timeRemainingSec"] = df["timeRemaining"].apply(time_str_to_seconds)
+    df["timeInPeriodSec"] = _time_strs_to_seconds(df["timeInPeriod"])
+    df["timeRemainingSec"] = _time_strs_to_seconds(df["timeRemaining"])
     for col in ["home_on_ice", "away_on_ice", "home_goalie", "away_goalie"]:
         df[col] = parsed[col]
     return (df, parsed) if return_raw else df
@@ -1742,10 +1749,12 @@ def _map_numbers(list_of_lists: list[Any], roster: pd.DataFrame, key: str) -> li
             out.append([sub])
     return out
 
-def scrape_shifts(game_id: int) -> pd.DataFrame:
+def scrape_shifts(game_id: int, api: Optional[Dict] = None) -> pd.DataFrame:
     html = scrapeHTMLShifts(game_id)
     parsed = parse_html_shifts(html["home"], html["away"])
-    api = getGameData(game_id)
+    # Callers that already hold the game's play-by-play JSON pass it in to skip a second fetch
+    if api is None:
+        api = getGameData(game_id)
     home_abbrev = api.get("homeTeam", {}).get("abbrev", "")
     away_abbrev = api.get("awayTeam", {}).get("abbrev", "")
 
@@ -1762,7 +1771,8 @@ def scrape_shifts(game_id: int) -> pd.DataFrame:
     )
 
     for col in ["start_time_in_period","start_time_remaining","end_time_in_period","end_time_remaining"]:
-        shifts[f"{col}_seconds"] = shifts[col].apply(lambda x: time_str_to_seconds(x) if isinstance(x, str) else x)
+        # The parser only emits MM:SS strings; cells it left out are NaN and stay NaN
+        shifts[f"{col}_seconds"] = _time_strs_to_seconds(shifts[col])
 
     if api["gameType"] not in (3, "3"):  # not playoff
         shifts["elapsed_time_start"] = np.where(
@@ -1804,7 +1814,8 @@ async def scrape_shifts_async(game_id: int) -> pd.DataFrame:
     )
 
     for col in ["start_time_in_period","start_time_remaining","end_time_in_period","end_time_remaining"]:
-        shifts[f"{col}_seconds"] = shifts[col].apply(lambda x: time_str_to_seconds(x) if isinstance(x, str) else x)
+        # The parser only emits MM:SS strings; cells it left out are NaN and stay NaN
+        shifts[f"{col}_seconds"] = _time_strs_to_seconds(shifts[col])
 
     if api["gameType"] not in (3, "3"):  # not playoff
         shifts["elapsed_time_start"] = np.where(
@@ -2250,7 +2261,7 @@ def scrape_game(game_id:Union[int,str],
     away_abbrev = api.get("awayTeam", {}).get("abbrev")
     rosters["isHome"] = (rosters["teamId"] == home_id).astype(int)
     rosters["fullName"] = rosters["firstName.default"] + " " + rosters["lastName.default"] 
-    shifts = scrape_shifts(game_id=game_id)
+    shifts = scrape_shifts(game_id=game_id, api=api)
     shifts_events = build_shifts_events(shifts)
     
     # flatten API
@@ -3802,6 +3813,27 @@ def build_shots_design_matrix(pbp_df: pd.DataFrame) -> pd.DataFrame:
     )
     return shots, X
 
+# The loaders below are cached per (path, mtime): a retrained model written over the same
+# file is picked up on the next call instead of the old booster being served for the process
+
+@lru_cache(maxsize=8)
+def _read_xg_booster(model_path: str, mtime_ns: int) -> "xgb.Booster":
+    booster = xgb.Booster()
+    booster.load_model(model_path)
+    return booster
+
+def _load_xg_booster(model_path: str) -> "xgb.Booster":
+    """Load the xG booster once per model file version; reused across games."""
+    return _read_xg_booster(model_path, os.stat(model_path).st_mtime_ns)
+
+@lru_cache(maxsize=8)
+def _read_training_columns(feat_path: str, mtime_ns: int) -> tuple:
+    return tuple(joblib.load(feat_path))
+
+def _load_training_columns(feat_path: str) -> tuple:
+    """Training feature order (after one-hot), read once per file version. Tuple so the cached value stays immutable."""
+    return _read_training_columns(feat_path, os.stat(feat_path).st_mtime_ns)
+
 def predict_xg_for_pbp(pbp_df: pd.DataFrame,
                        model_path: str = MODEL_PATH,
                        feat_path: str = FEAT_PATH,
@@ -3812,10 +3844,8 @@ def predict_xg_for_pbp(pbp_df: pd.DataFrame,
     # Build design matrix from PBP
     shots, X = build_shots_design_matrix(pbp_df)
 
-    # Load model + training feature order
-    booster = xgb.Booster()
-    booster.load_model(model_path)
-    train_cols = joblib.load(feat_path)  # list of column names used during training (after one-hot)
+    # Load model (cached per path; feature order is loaded by the alignment step)
+    booster = _load_xg_booster(model_path)
 
     # Align columns to training (create missing, keep order)
     X_aligned = _align_to_training_columns(X, feat_path)
@@ -3832,8 +3862,7 @@ def predict_xg_for_pbp(pbp_df: pd.DataFrame,
 
 def _align_to_training_columns(X: pd.DataFrame, feat_path: str) -> pd.DataFrame:
     """Safely align feature matrix X to the training column list stored at feat_path."""
-    import joblib
-    train_cols = joblib.load(feat_path)  # list of column names used during training (after one-hot)
+    train_cols = list(_load_training_columns(feat_path))  # column names used during training (after one-hot)
 
     # Ensure train_cols are unique (defensive)
     if len(train_cols) != len(pd.Index(train_cols).unique()):
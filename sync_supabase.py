@@ -1,48 +1,18 @@
-import subprocess
-# Utility: Safe float conversion
-def safe_float(val):
-    try:
-        if pd.isna(val):
-            return np.nan
-        return float(val)
-    except Exception:
-        return np.nan
-
-# Universal DataFrame cleaning to handle NAType, NaN, None before analytics
-def clean_dataframe_for_analytics(df):
-    """
-    Bulletproof DataFrame cleaning for analytics:
-    - Replace all pd.NA with np.nan (regardless of dtype)
-    - Coerce all columns to numeric where possible (errors become np.nan)
-    - Replace pd.NA/None in non-numeric columns with empty string
-    - Log columns that could not be converted to numeric
-    """
-    import warnings
-    df = df.copy()
-    # Replace all pd.NA with np.nan everywhere
-    df = df.replace({pd.NA: np.nan})
-    non_numeric_cols = []
-    for col in df.columns:
-        # Try to convert to numeric, if fails, keep as object
-        try:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-            # If all values are nan after conversion, treat as non-numeric
-            if df[col].isna().all():
-                non_numeric_cols.append(col)
-                df[col] = df[col].astype(str).replace({"<NA>": "", "nan": "", "None": ""})
-        except Exception:
-            non_numeric_cols.append(col)
-            df[col] = df[col].astype(str).replace({"<NA>": "", "nan": "", "None": ""})
-    if non_numeric_cols:
-        LOG.info(f"[CLEAN] Non-numeric columns (left as string): {sorted(non_numeric_cols)}")
-    return df
 import os
 import sys
 import logging
 import pandas as pd
-import numpy as np
 import json
+import hashlib
+import asyncio
+import threading
+import time
+import joblib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
+from pandas.api.types import infer_dtype
+from postgrest.types import ReturnMethod
 from supabase import create_client, Client
 
 # Scrapers from your package
@@ -51,18 +21,67 @@ from scrapernhl.scrapers.roster import scrapeRoster
 from scrapernhl.scrapers.schedule import scrapeSchedule
 from scrapernhl.scrapers.standings import scrapeStandings
 from scrapernhl.scrapers.games import scrapePlays 
-from scrapernhl import engineer_xg_features, predict_xg_for_pbp, on_ice_stats_by_player_strength
+from scrapernhl import scrape_game, engineer_xg_features, predict_xg_for_pbp, on_ice_stats_by_player_strength, MODEL_PATH, FEAT_PATH
+
+# Copy-on-Write and the inferred str dtype are pandas 3 defaults; opt pandas 2.x into the same semantics
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+    pd.set_option('future.infer_string', True)
+
+# Per-process memoization for scrapers that run_sync may re-enter (retries, debug + daily in one run).
+# The cached frames are shared between callers, so treat them as read-only.
+cached_scrape_teams = lru_cache(maxsize=64)(scrapeTeams)
+cached_scrape_schedule = lru_cache(maxsize=64)(scrapeSchedule)
 
 # Logging Configuration
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 LOG = logging.getLogger(__name__)
 
-# Supabase Configuration
-supabase: Client = create_client(os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_KEY"))
+# Supabase Configuration (client is created lazily by get_client)
+@lru_cache(maxsize=1)
+def get_client() -> Client:
+    """
+    Builds the Supabase client on first use and shares it across threads.
+    Its httpx session keeps connections alive, so TLS setup is paid once per run.
+    """
+    url, key = os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_KEY")
+    if not url or not key:
+        raise RuntimeError("SUPABASE_URL and SUPABASE_KEY must be set")
+    return create_client(url, key)
+
+# Optional direct Postgres URL: when set, bulk loads go through COPY (psycopg, the 'postgres' extra)
+# instead of REST upserts
+DB_URL = os.environ.get("SUPABASE_DB_URL")
 
 # Local cache for schema-compliant columns based on final_schema.sql
 DB_COLS = {}
 
+# Concurrency limits for the team loop: scraper threads vs. in-flight Supabase writes
+TEAM_WORKERS = 8
+UPSERT_SLOTS = threading.Semaphore(4)
+# REST upserts are split into chunks of this many rows, sent by up to UPSERT_CHUNK_WORKERS threads
+UPSERT_CHUNK = 500
+UPSERT_CHUNK_WORKERS = 4
+# Per-chunk retries, with exponential backoff starting at UPSERT_BACKOFF seconds
+UPSERT_RETRIES = 2
+UPSERT_BACKOFF = 0.5
+# Concurrent scrape_game calls in the game phase
+GAME_FETCHES = 16
+# On-disk cache of xG-scored play-by-play for completed games, one pickle per game ID,
+# filed under a fingerprint of the scraper and xG model that produced it (see pbp_cache_key)
+PBP_CACHE_DIR = os.environ.get("PBP_CACHE_DIR", os.path.join(".cache", "pbp"))
+# Content digests of the last successful sync per table and target database
+SYNC_STATE_DIR = os.environ.get("SYNC_STATE_DIR", os.path.join(".cache", "sync"))
+
+# Grouping keys of the per-game on-ice stats rolled up into player_stats
+STAT_KEYS = ['player1Id', 'player1Name', 'eventTeam', 'strength']
+
+_DOTS_TO_UNDERSCORES = str.maketrans('.', '_')
+
+def db_columns(columns):
+    # Scraper column labels to DB names (dots to underscores, lowercase) with vectorized Index.str ops
+    return columns.astype(str).str.translate(_DOTS_TO_UNDERSCORES).str.lower()
+
 def get_valid_cols(table_name):
     """
     Dynamically fetches column names from the database. 
@@ -70,214 +89,472 @@ def get_valid_cols(table_name):
     """
     if table_name in DB_COLS: return DB_COLS[table_name]
     try:
-        res = supabase.table(table_name).select("*").limit(1).execute()
-        DB_COLS[table_name] = list(res.data[0].keys()) if res.data else []
+        res = get_client().table(table_name).select("*").limit(1).execute()
+        # frozenset: literal_sync only does membership tests against it
+        DB_COLS[table_name] = frozenset(res.data[0].keys()) if res.data else frozenset()
         return DB_COLS[table_name]
     except Exception as e:
         LOG.warning(f"Metadata fetch failed for {table_name}: {e}")
-        return []
+        return frozenset()
+
+def _to_int(col):
+    # Integer columns arrive as float64 whenever a value is missing; keep the gaps as <NA>
+    return col.round().astype('Int64')
+
+def _to_json(col):
+    # Plain string/bool/empty columns (the common case) pass through without a per-cell map;
+    # only columns holding lists or dicts infer as 'mixed'
+    if not infer_dtype(col, skipna=True).startswith('mixed'):
+        return col
+    return col.map(lambda v: json.dumps(v, default=str) if isinstance(v, (list, dict)) else v)
 
-def literal_sync(table_name, df, p_key):
+def pick_caster(col, dtype):
+    """
+    Picks the column-wide cast literal_sync applies before upload, or None.
+    The decision depends only on the column name and dtype, never on a cell.
+    """
+    if dtype.kind == 'f' and (col == 'season' or col.endswith('id')):
+        return _to_int
+    if dtype == object:
+        return _to_json
+    return None
+
+def literal_sync(table_name, df, p_key, skip_unchanged=True):
     """
     Synchronizes DataFrame to Supabase with strict column alignment.
     Ignores extra data to prevent PGRST204 errors and neutralizes NAType.
+    With skip_unchanged, a frame identical to the last successful sync of the table is not re-sent.
     """
     if df.empty:
         return
 
-    # 1. Column Alignment (dots to underscores, lowercase)
-    df.columns = [str(c).replace('.', '_').lower() for c in df.columns]
+    # 1. Column Alignment (dots to underscores, lowercase) without touching the caller's frame
+    df = df.set_axis(db_columns(df.columns), axis=1)
 
     # 2. Whitelist Filtering: Only keep columns that exist in your SQL schema
     valid = get_valid_cols(table_name)
     if valid:
-        original_cols = set(df.columns)
-        valid_set = set(valid)
-        drop_cols = original_cols - valid_set
-        if drop_cols:
-            LOG.info(f"[{table_name}] Dropping columns not in DB schema: {sorted(drop_cols)}")
-        df = df[[c for c in df.columns if c in valid]]
+        keep = df.columns.isin(valid)
+        if not keep.all():
+            LOG.info(f"[{table_name}] Dropping columns not in DB schema: {sorted(df.columns[~keep])}")
+            df = df.loc[:, keep]
     else:
         LOG.warning(f"[{table_name}] No valid columns found in DB schema; skipping sync.")
         return
 
-    # 3. CRITICAL: Manual NAType and Float Sanitation
-    # Converts pandas 2.0 NAType sentinels to standard Python None
-    def clean_cell(val):
-        if pd.isna(val): return None
-        if isinstance(val, (np.integer, int)): return int(val)
-        if isinstance(val, (np.floating, float)): return float(val)
-        return val
-
-    records = []
-    for _, row in df.iterrows():
-        # Clean every cell to ensure standard types reach the DB driver
-        record = {k: clean_cell(v) for k, v in row.to_dict().items()}
-
-        # 4. JSONB Serialization for columns like 'teams' or 'tvbroadcasts'
-        for k, v in record.items():
-            if isinstance(v, (list, dict)):
-                record[k] = json.dumps(v, default=str)
-        records.append(record)
-
-    # 5. Deduplicate Payload
+    # 3. Column casts, dispatched once per column: JSONB serialization for nested
+    # object columns like 'teams' or 'tvbroadcasts', float-widened ints back to Int64.
+    # The new columns are swapped in with one assign instead of a __setitem__ per column.
+    casters = {col: pick_caster(col, dtype) for col, dtype in df.dtypes.items()}
+    cast = {col: caster(df[col]) for col, caster in casters.items() if caster is not None}
+    if cast:
+        df = df.assign(**cast)
+
+    # 4. CRITICAL: NAType and Float Sanitation
+    # object dtype holds native int/float, and one mask turns NaN/NA/NaT into None
+    df = df.astype(object).where(df.notna(), None)
+
+    # 5. Deduplicate Payload (last occurrence of a primary key wins) and drop rows with a null key,
+    # which Postgres would reject; both conditions go into one mask and one row selection
     pk_list = [k.strip() for k in p_key.split(',')]
-    unique_map = {tuple(r.get(k) for k in pk_list): r for r in records}
-    payload = list(unique_map.values())
+    missing_pk = [k for k in pk_list if k not in df.columns]
+    if missing_pk:
+        LOG.error(f"[{table_name}] Primary key column(s) missing: {missing_pk}. Skipping sync.")
+        return
+    has_pk = df[pk_list].notna().all(axis=1)
+    if not has_pk.all():
+        LOG.warning(f"[{table_name}] Dropping {int((~has_pk).sum())} row(s) with a null primary key.")
+    df = df[has_pk & ~df.duplicated(subset=pk_list, keep='last')]
+    if df.empty:
+        return
+
+    # 6. Skip frames identical to the last successful sync of this table (catchup mode always writes)
+    digest, state = frame_digest(df), digest_path(table_name, df)
+    if skip_unchanged and last_digest(state) == digest:
+        LOG.info(f"[{table_name}] Unchanged since last sync ({len(df)} records); skipping upsert.")
+        return
+
+    if DB_URL:
+        if copy_sync(table_name, df, pk_list):
+            remember_digest(state, digest)
+        return
+
+    # Chunks are row slices of the frame; each is turned into records only when its upload starts,
+    # so at most UPSERT_CHUNK_WORKERS chunks of dicts exist at once instead of the whole table
+    chunks = [df.iloc[i:i + UPSERT_CHUNK] for i in range(0, len(df), UPSERT_CHUNK)]
+    # Chunks go out in parallel; UPSERT_SLOTS still caps in-flight requests across all callers
+    with ThreadPoolExecutor(max_workers=min(len(chunks), UPSERT_CHUNK_WORKERS)) as pool:
+        futures = [pool.submit(upsert_chunk, table_name, chunk, p_key) for chunk in chunks]
+    failed = 0
+    for chunk, fut in zip(chunks, futures):
+        if fut.exception() is not None:
+            failed += len(chunk)
+            LOG.error(f"Sync Failure for '{table_name}' ({len(chunk)} of {len(df)} records): {fut.exception()}")
+    if not failed:
+        LOG.info(f"Sync Success: {len(df)} records to '{table_name}' in {len(chunks)} chunk(s)")
+        remember_digest(state, digest)
+
+def frame_digest(df):
+    return hashlib.sha1(pd.util.hash_pandas_object(df, index=False).values.tobytes()).hexdigest()
+
+def sync_target():
+    # Where writes land (COPY URL or REST project), hashed so credentials never reach the state files
+    return hashlib.sha1((DB_URL or os.environ.get("SUPABASE_URL", "")).encode()).hexdigest()[:12]
+
+def digest_path(table_name, df):
+    # Keyed by target, so another project or a reset database starts without digests,
+    # and by column set: players is written both from rosters and from the game registry
+    cols = hashlib.sha1(",".join(df.columns).encode()).hexdigest()[:12]
+    return os.path.join(SYNC_STATE_DIR, f"{table_name}_{sync_target()}_{cols}.sha1")
+
+def last_digest(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def remember_digest(path, digest):
+    try:
+        os.makedirs(SYNC_STATE_DIR, exist_ok=True)
+        with open(path, "w") as f:
+            f.write(digest)
+    except OSError as e:
+        LOG.warning(f"Could not record sync digest at {path}: {e}")
+
+def frame_records(df):
+    # The frame is all-object with native Python scalars already, so plain tuples zipped with the
+    # column names give the same records as to_dict(orient='records') without its per-cell boxing
+    cols = list(df.columns)
+    return [dict(zip(cols, row)) for row in df.itertuples(index=False, name=None)]
+
+def upsert_chunk(table_name, chunk, p_key):
+    """
+    Upserts one row slice of a cleaned frame, retrying transient failures so a blip costs one chunk
+    rather than the table. Raises the last error once UPSERT_RETRIES is exhausted.
+    """
+    payload = frame_records(chunk)
+    for attempt in range(UPSERT_RETRIES + 1):
+        try:
+            with UPSERT_SLOTS:
+                # return=minimal: PostgREST acknowledges without echoing every row back
+                get_client().table(table_name).upsert(payload, on_conflict=p_key, returning=ReturnMethod.minimal).execute()
+            return
+        except Exception as e:
+            if attempt == UPSERT_RETRIES:
+                raise
+            LOG.warning(f"Retrying upsert to '{table_name}' ({len(chunk)} records, attempt {attempt + 1}): {e}")
+            time.sleep(UPSERT_BACKOFF * 2 ** attempt)
+
+def copy_sync(table_name, df, pk_list):
+    """
+    Bulk-loads an already cleaned frame over a direct Postgres connection.
+    Rows are streamed with COPY into a temp staging table and merged into the
+    target with one INSERT ... ON CONFLICT, skipping the PostgREST JSON path.
+    Returns True when the merge committed.
+    """
+    import psycopg
+    from psycopg import sql
+
+    # Table and column names are quoted as identifiers, never spliced into the statement text
+    table, stage = sql.Identifier(table_name), sql.Identifier(f"stage_{table_name}")
+    cols = sql.SQL(", ").join(map(sql.Identifier, df.columns))
+    keys = sql.SQL(", ").join(map(sql.Identifier, pk_list))
+    updates = [sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(c)) for c in df.columns if c not in pk_list]
+    on_conflict = sql.SQL("DO UPDATE SET {}").format(sql.SQL(", ").join(updates)) if updates else sql.SQL("DO NOTHING")
+    try:
+        with UPSERT_SLOTS, psycopg.connect(DB_URL) as conn, conn.cursor() as cur:
+            cur.execute(sql.SQL("CREATE TEMP TABLE {} (LIKE {} INCLUDING DEFAULTS) ON COMMIT DROP").format(stage, table))
+            with cur.copy(sql.SQL("COPY {} ({}) FROM STDIN").format(stage, cols)) as copy:
+                for row in df.itertuples(index=False, name=None):
+                    copy.write_row(row)
+            cur.execute(
+                sql.SQL("INSERT INTO {} ({}) SELECT {} FROM {} ON CONFLICT ({}) {}").format(
+                    table, cols, cols, stage, keys, on_conflict)
+            )
+        LOG.info(f"Sync Success (COPY): {len(df)} records to '{table_name}'")
+        return True
+    except Exception as e:
+        LOG.error(f"Sync Failure (COPY) for '{table_name}': {e}")
+        return False
+
+def individual_counts(pbp):
+    """
+    Goals, shots and primary/secondary assists per player for one game, in a single groupby.
+    Strength is the event team's detailedGameStrength so it lines up with the on-ice labels.
+    """
+    ev = pbp.loc[pbp['Event'].isin(['SHOT', 'GOAL']), ['Event', 'eventTeam', 'detailedGameStrength',
+                                                        'player1Id', 'player2Id', 'player3Id']]
+    # One long frame of (player, role) pairs; player2/3 only count as assisters on goals
+    long = ev.melt(id_vars=['Event', 'eventTeam', 'detailedGameStrength'], var_name='role', value_name='playerId')
+    long = long.dropna(subset=['playerId', 'eventTeam', 'detailedGameStrength'])
+    # Each mask is evaluated once and reused for the row filter and the counters
+    is_goal, is_shooter = long['Event'].eq('GOAL'), long['role'].eq('player1Id')
+    keep = is_shooter | is_goal
+    long, is_goal, is_shooter = long[keep], is_goal[keep], is_shooter[keep]
+    counts = pd.DataFrame({
+        'player1Id': long['playerId'].astype('int64'),
+        'eventTeam': long['eventTeam'],
+        'strength': long['detailedGameStrength'],
+        'goals': (is_goal & is_shooter).astype('int8'),
+        'shots': is_shooter.astype('int8'),
+        'a1': long['role'].eq('player2Id').astype('int8'),
+        'a2': long['role'].eq('player3Id').astype('int8'),
+    })
+    return counts.groupby(['player1Id', 'eventTeam', 'strength'], as_index=False, sort=False)[['goals', 'shots', 'a1', 'a2']].sum()
+
+def accumulate_game_stats(totals, stats):
+    """
+    Adds one game's on-ice stats into the running season sums.
+    Keys are STAT_KEYS tuples; missing metric values are skipped like sum() does.
+    """
+    if stats.empty:
+        return
+    metrics = stats.drop(columns=STAT_KEYS).select_dtypes('number').columns.tolist()
+    keys = stats[STAT_KEYS].itertuples(index=False, name=None)
+    values = stats[metrics].itertuples(index=False, name=None)
+    for key, row in zip(keys, values):
+        if any(k != k for k in key):  # NaN key, dropped just like groupby(dropna=True)
+            continue
+        bucket = totals.setdefault(key, dict.fromkeys(metrics, 0))
+        for metric, v in zip(metrics, row):
+            if v == v:
+                bucket[metric] = bucket.get(metric, 0) + v
+
+def game_stats(pbp, gid=None):
+    """
+    One game's skater stats per STAT_KEYS row: on-ice totals plus individual goals, shots and assists.
+    Takes the xG-scored pbp as scraped; numeric coercion would blank the Event and team columns.
+    """
+    stats = on_ice_stats_by_player_strength(pbp, include_goalies=False)
+    if stats.empty:
+        return stats
+    counts = individual_counts(pbp)
+    cols = ['goals', 'shots', 'a1', 'a2']
+    stats = stats.merge(counts, on=['player1Id', 'eventTeam', 'strength'], how='left', validate='one_to_one')
+    stats[cols] = stats[cols].fillna(0)
+    # Counts whose player/team/strength has no on-ice row are lost in the left merge; say so
+    expected, merged = counts[cols].sum(), stats[cols].sum()
+    if not expected.eq(merged).all():
+        LOG.warning(f"Game {gid}: individual counts without an on-ice row were dropped "
+                    f"(expected {expected.to_dict()}, kept {merged.astype('int64').to_dict()})")
+    # Each game row counts once, so the season sum is games played per player and strength
+    stats['gamesplayed'] = 1
+    return stats
+
+def season_rollup(totals, season):
+    """
+    Turns the accumulated season sums into player_stats rows (DB column names, one id per player and strength).
+    """
+    agg = pd.DataFrame([{**dict(zip(STAT_KEYS, key)), **sums} for key, sums in totals.items()])
+    agg.columns = db_columns(agg.columns)
+    agg['assists'] = agg['a1'] + agg['a2']
+    agg['points'] = agg['goals'] + agg['assists']
+    agg['season'] = season
+    agg['id'] = agg['player1id'].round().astype('Int64').astype('string') + f"_{season}_" + agg['strength'].astype('string')
+    return agg
+
+def pbp_cache_key():
+    """
+    Fingerprint (mtime and size) of the files whose output a cached pbp holds: the scraper
+    and xG module, the model and its feature list. Retraining or editing any of them moves
+    new entries to a fresh directory, so stale xG is never read back.
+    """
+    sources = (sys.modules[scrape_game.__module__].__file__, sys.modules[predict_xg_for_pbp.__module__].__file__,
+               MODEL_PATH, FEAT_PATH)
+    parts = []
+    for path in dict.fromkeys(sources):
+        try:
+            st = os.stat(path)
+            parts.append(f"{path}:{st.st_mtime_ns}:{st.st_size}")
+        except OSError:
+            parts.append(f"{path}:missing")
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+
+def pbp_cache_path(gid):
+    return os.path.join(PBP_CACHE_DIR, pbp_cache_key(), f"{gid}.pkl")
+
+def load_cached_pbp(gid):
+    """
+    Returns the xG-scored play-by-play stored for gid, or None on a miss or unreadable file.
+    """
+    path = pbp_cache_path(gid)
+    if not os.path.exists(path):
+        return None
+    try:
+        return joblib.load(path)
+    except Exception as e:
+        LOG.warning(f"Discarding unreadable PBP cache for Game {gid}: {e}")
+        return None
 
+def store_cached_pbp(gid, pbp):
+    # Write to a temp file and rename, so an interrupted run never leaves a truncated pickle behind
+    path = pbp_cache_path(gid)
     try:
-        supabase.table(table_name).upsert(payload, on_conflict=p_key).execute()
-        LOG.info(f"Sync Success: {len(payload)} records to '{table_name}'")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(pbp, f"{path}.tmp", compress=3)
+        os.replace(f"{path}.tmp", path)
     except Exception as e:
-        LOG.error(f"Sync Failure for '{table_name}': {e}")
+        LOG.warning(f"PBP cache write failed for Game {gid}: {e}")
+
+async def scrape_games(game_ids):
+    """
+    Scrapes play-by-play for game_ids concurrently, at most GAME_FETCHES at a time.
+    Yields (gid, pbp) in completion order; pbp is None when the scrape failed.
+    Landed games wait in a queue of GAME_FETCHES; a fetcher only starts its next game once
+    its last one is queued, so a slow consumer caps how much pbp is held in memory.
+    """
+    pending = iter(game_ids)
+    landed = asyncio.Queue(maxsize=GAME_FETCHES)
+
+    async def fetcher():
+        for gid in pending:
+            try:
+                pbp = await asyncio.to_thread(scrape_game, gid)
+            except Exception as e:
+                LOG.error(f"Scrape error for Game {gid}: {e}")
+                pbp = None
+            await landed.put((gid, pbp))
+
+    fetchers = [asyncio.create_task(fetcher()) for _ in range(min(GAME_FETCHES, len(game_ids)))]
+    try:
+        for _ in range(len(game_ids)):
+            yield await landed.get()
+    finally:
+        for task in fetchers:
+            task.cancel()
 
 def run_sync(mode="daily"):
     # Using 2024-2025 Regular Season as requested
     S_STR, S_INT = "20242025", 20242025
     LOG.info(f"--- STARTING PRODUCTION SYNC | Mode: {mode} ---")
+    # Catchup rewrites every table even when its content matches the last sync
+    skip = mode != "catchup"
+    get_client()  # fail on missing credentials before any scraping starts
+    if DB_URL:
+        try:
+            import psycopg  # noqa: F401
+        except ImportError:
+            raise RuntimeError("SUPABASE_DB_URL is set but psycopg is not installed (pip install 'scrapernhl[postgres]')")
 
-    # 1. Base Tables (Teams, Standings) - Use CLI to generate clean files
-    subprocess.run(["python", "-m", "scrapernhl.cli", "teams", "--db-schema", "--output", "teams.csv"], check=True)
-    teams_df = pd.read_csv("teams.csv")
-    literal_sync("teams", teams_df, "id")
+    # 1. Base Tables (Teams, Standings)
+    teams_df = cached_scrape_teams()
+    literal_sync("teams", teams_df, "id", skip_unchanged=skip)
 
     # Standings: fallback to in-process for now (can be CLI-ized if needed)
     std = scrapeStandings()
     if not std.empty:
-        std.columns = [str(c).replace('.', '_').lower() for c in std.columns]
+        std.columns = db_columns(std.columns)
         std['id'] = std['date'].astype(str) + "_" + std['teamabbrev_default'].astype(str)
-        literal_sync("standings", std, "id")
+        literal_sync("standings", std, "id", skip_unchanged=skip)
 
     # 2. Roster and Schedule Discovery
-    # Use CLI to generate clean rosters and schedules for each team
+    # Teams are independent and I/O-bound, so each one runs on its own pool thread
     active_teams = ['MTL', 'BUF'] if mode == "debug" else teams_df['abbrev'].unique().tolist()
-    global_games = set()
 
-    for team in active_teams:
+    def process_team(team):
         LOG.info(f"Processing context for team: {team}")
         # Roster
-        roster_out = f"{team}_roster.csv"
-        subprocess.run(["python", "-m", "scrapernhl.cli", "roster", team, S_STR, "--db-schema", "--output", roster_out], check=True)
-        ros = pd.read_csv(roster_out)
+        ros = scrapeRoster(team, S_STR)
         if not ros.empty:
             ros['season'] = S_INT
             ros['teamabbrev'] = team
-            literal_sync("players", ros.copy(), "id")
-            literal_sync("rosters", ros, "id,season")
 
         # Schedule
-        sched_out = f"{team}_schedule.csv"
-        subprocess.run(["python", "-m", "scrapernhl.cli", "schedule", team, S_STR, "--db-schema", "--output", sched_out], check=True)
-        sched = pd.read_csv(sched_out)
+        sched = cached_scrape_schedule(team, S_STR)
+        if sched.empty:
+            return ros, {}
+        # Look the three needed columns up case-insensitively instead of renaming a copy of the frame
+        col = {str(c).lower(): c for c in sched.columns}
         # Filter strictly for Regular Season (GameType 2)
-        sched_f = sched[(sched['gametype'] == 2) & (sched['gamestate'].isin(['FINAL', 'OFF']))]
-        global_games.update(sched_f['id'].tolist())
+        completed = (sched[col['gametype']] == 2) & sched[col['gamestate']].isin(['FINAL', 'OFF'])
+        return ros, dict(zip(sched.loc[completed, col['id']], sched.loc[completed, col['gamestate']]))
+
+    # Rosters are gathered from every team and written with one players and one rosters upsert.
+    # global_games maps each completed game ID to its gameState ('FINAL' or 'OFF').
+    global_games, team_rosters = {}, {}
+    with ThreadPoolExecutor(max_workers=TEAM_WORKERS) as pool:
+        futures = {pool.submit(process_team, team): team for team in active_teams}
+        # Collect in completion order; one failing team is logged instead of aborting the rest
+        for fut in as_completed(futures):
+            team = futures[fut]
+            try:
+                ros, team_games = fut.result()
+            except Exception as e:
+                LOG.error(f"Team processing error for {team}: {e}")
+                continue
+            if not ros.empty:
+                team_rosters[team] = ros
+            global_games.update(team_games)
+
+    rostered_ids = set()
+    if team_rosters:
+        # Concatenated in team order, not completion order: the keep-last dedupe in literal_sync
+        # must pick the same team for a player listed on two rosters (mid-season trade) every run
+        all_ros = pd.concat([team_rosters[t] for t in active_teams if t in team_rosters], ignore_index=True)
+        literal_sync("players", all_ros, "id", skip_unchanged=skip)
+        literal_sync("rosters", all_ros, "id,season", skip_unchanged=skip)
+        rostered_ids = set(all_ros['id'].dropna())
 
     # 3. Analytics Processing (Game Phase)
-    game_list = sorted(list(global_games))
+    game_list = sorted(global_games)
     if mode == "debug": game_list = game_list[:3]
     
-    all_game_stats = []
-    for gid in game_list:
-        try:
-            LOG.info(f"Ingesting Analytics for Game: {gid}")
-            if df.empty:
-                LOG.warning(f"[{table_name}] DataFrame is empty, skipping sync.")
-                return
-
-            # 1. Column Alignment (dots to underscores, lowercase)
-            df.columns = [str(c).replace('.', '_').lower() for c in df.columns]
-
-            # 2. Whitelist Filtering: Only keep columns that exist in your SQL schema
-            valid = get_valid_cols(table_name)
-            if valid:
-                original_cols = set(df.columns)
-                valid_set = set(valid)
-                drop_cols = original_cols - valid_set
-                if drop_cols:
-                    LOG.info(f"[{table_name}] Dropping columns not in DB schema: {sorted(drop_cols)}")
-                df = df[[c for c in df.columns if c in valid]]
-            else:
-                LOG.warning(f"[{table_name}] No valid columns found in DB schema; skipping sync.")
-                return
-
-            # 3. Explicit type casting (optional: customize per table/column as needed)
-            # Example: enforce int for id columns, float for numeric, str for text
-            for col in df.columns:
-                if col.endswith('id') or col in ('id', 'season'):
-                    try:
-                        df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
-                    except Exception:
-                        pass
-                elif df[col].dtype.kind in 'fiu':
-                    try:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-                    except Exception:
-                        pass
-                else:
-                    try:
-                        df[col] = df[col].astype(str).replace({"<NA>": "", "nan": "", "None": ""})
-                    except Exception:
-                        pass
-
-            # 4. Primary Key Null Check
-            pk_list = [k.strip() for k in p_key.split(',')]
-            if df[pk_list].isnull().any().any():
-                LOG.error(f"[{table_name}] Null value(s) in primary key columns: {pk_list}. Skipping sync.")
-                return
-
-            # 5. CRITICAL: Manual NAType and Float Sanitation
-            def clean_cell(val):
-                if pd.isna(val): return None
-                if isinstance(val, (np.integer, int)): return int(val)
-                if isinstance(val, (np.floating, float)): return float(val)
-                return val
-
-            records = []
-            for _, row in df.iterrows():
-                # Clean every cell to ensure standard types reach the DB driver
-                record = {k: clean_cell(v) for k, v in row.to_dict().items()}
-
-                # 6. JSONB Serialization for columns like 'teams' or 'tvbroadcasts'
-                for k, v in record.items():
-                    if isinstance(v, (list, dict)):
-                        record[k] = json.dumps(v, default=str)
-                records.append(record)
-
-            # 7. Deduplicate Payload
-            unique_map = {tuple(r.get(k) for k in pk_list): r for r in records}
-            payload = list(unique_map.values())
+    # Season totals are folded in game by game, so per-game frames never pile up for a concat.
+    # Scrapes overlap on worker threads. The xG/stats stages for each landed game run on a thread
+    # too, one game at a time, so the event loop keeps starting fetches while a game is scored.
+    season_totals = {}
+
+    def ingest(gid, pbp):
+        accumulate_game_stats(season_totals, game_stats(pbp, gid))
+        LOG.info(f"Analytics completed for game {gid}")
+
+    def score_and_ingest(gid, pbp):
+        pbp = predict_xg_for_pbp(engineer_xg_features(pbp))
+        # FINAL games can still get scoring corrections; only official (OFF) games are cached
+        if global_games[gid] == 'OFF':
+            store_cached_pbp(gid, pbp)
+        ingest(gid, pbp)
+
+    async def ingest_games():
+        # Official games never change, so ones already on disk skip the scrape and xG model
+        fresh = []
+        for gid in game_list:
+            pbp = load_cached_pbp(gid)
+            if pbp is None:
+                fresh.append(gid)
+                continue
+            try:
+                ingest(gid, pbp)
+            except Exception as e:
+                LOG.error(f"Processing error for Game {gid}: {e}")
+        LOG.info(f"PBP cache: {len(game_list) - len(fresh)} hit(s), {len(fresh)} game(s) to scrape")
 
+        async for gid, pbp in scrape_games(fresh):
+            if pbp is None:
+                continue
             try:
-                supabase.table(table_name).upsert(payload, on_conflict=p_key).execute()
-                LOG.info(f"Sync Success: {len(payload)} records to '{table_name}'")
+                LOG.info(f"Ingesting Analytics for Game: {gid}")
+                await asyncio.to_thread(score_and_ingest, gid, pbp)
             except Exception as e:
-                LOG.error(f"Sync Failure for '{table_name}': {e}")
-                print("==== stats_clean.iloc[0].to_dict() ====")
-                print(stats_clean.iloc[0].to_dict())
+                LOG.error(f"Processing error for Game {gid}: {e}")
 
-            all_game_stats.append(on_ice_stats_by_player_strength(stats_clean, include_goalies=False))
-            LOG.info(f"Analytics completed for game {gid}")
-        except Exception as e:
-            LOG.error(f"Processing error for Game {gid}: {e}")
+    asyncio.run(ingest_games())
 
     # 4. Final Aggregation and Player Registry
-    if all_game_stats:
+    if season_totals:
         LOG.info("Finalizing Player Registry from game evidence...")
-        combined = pd.concat(all_game_stats)
-        combined.columns = [str(c).replace('.', '_').lower() for c in combined.columns]
-        
+        agg = season_rollup(season_totals, S_INT)
+
         # Register any player ID found in games not on official team rosters
-        u_pids = combined[['player1id', 'player1name']].dropna().drop_duplicates()
+        u_pids = agg[['player1id', 'player1name']].dropna().drop_duplicates('player1id')
+        u_pids = u_pids[~u_pids['player1id'].isin(rostered_ids)]
         u_pids = u_pids.rename(columns={'player1name': 'firstname_default', 'player1id': 'id'})
-        literal_sync("players", u_pids, "id")
+        literal_sync("players", u_pids, "id", skip_unchanged=skip)
 
         # Rollup seasonal player stats
-        agg = combined.groupby(['player1id', 'player1name', 'eventteam', 'strength']).sum(numeric_only=True).reset_index()
-        agg['season'] = S_INT
-        agg['id'] = agg.apply(lambda r: f"{int(r.player1id)}_{S_INT}_{r.strength}", axis=1)
         # Note: player_stats table must be created to receive this data
-        literal_sync("player_stats", agg, "id")
+        literal_sync("player_stats", agg, "id", skip_unchanged=skip)
 
 if __name__ == "__main__":
     import argparse